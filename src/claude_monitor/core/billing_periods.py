@@ -4,12 +4,13 @@ Handles different types of billing periods (daily, weekly, monthly, custom)
 and provides utilities for calculating period boundaries and aggregating costs.
 """
 
-import calendar
+import functools
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Tuple
 
 from claude_monitor.core.models import (
+    _VECTORIZE_MIN_ENTRIES,
     BillingPeriod,
     BillingPeriodType,
     BillingPeriodSummary,
@@ -19,16 +20,79 @@ from claude_monitor.utils.time_utils import TimezoneHandler
 
 logger = logging.getLogger(__name__)
 
-
-def _ensure_timezone(dt: datetime, target_tz) -> datetime:
-    """Helper function to ensure datetime has correct timezone."""
-    if dt.tzinfo is None:
-        if hasattr(target_tz, 'localize'):
-            return target_tz.localize(dt)
+_ZERO_OFFSET = timedelta(0)
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_timezone(name: str):
+    """Resolve a timezone name to a tzinfo object, cached per name.
+
+    pytz.timezone() reads zoneinfo files from disk, so repeated calculator
+    instantiations with the same timezone string hit this cache instead.
+    """
+    if name == "UTC":
+        return timezone.utc
+    import pytz
+
+    return pytz.timezone(name)
+
+
+# Rata-die conversion on the "computational calendar": years start in
+# March so February — the only variable-length month — falls last, which
+# lets month offsets collapse to the 153-day five-month block formula and
+# keeps leap handling to pure integer division (no per-month branches).
+def _ymd_to_rata(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    if month < 3:
+        year -= 1
+        month += 12
+    return (
+        365 * year + year // 4 - year // 100 + year // 400
+        + (153 * (month - 3) + 2) // 5
+        + day - 1
+        - 719468
+    )
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Number of days in a month as a rata-die difference."""
+    next_first = _ymd_to_rata(year + (month == 12), month % 12 + 1, 1)
+    return next_first - _ymd_to_rata(year, month, 1)
+
+
+@functools.lru_cache(maxsize=512)
+def _month_bounds(
+    year: int, month: int, day: int, reset_day: int
+) -> Tuple[int, int, int, int, int, int]:
+    """Pure integer core of the monthly boundary calculation.
+
+    Returns (start_year, start_month, start_day, end_year, end_month,
+    end_day) for the monthly period containing the given date. Keeping the
+    arithmetic free of datetime objects makes it cacheable and cheap to
+    call from recent-period loops.
+    """
+    max_day = _days_in_month(year, month)
+    actual_reset_day = min(reset_day, max_day)
+
+    if day < actual_reset_day:
+        # Period started at last month's reset
+        if month == 1:
+            start_year, start_month = year - 1, 12
         else:
-            return dt.replace(tzinfo=target_tz)
+            start_year, start_month = year, month - 1
+        prev_max_day = _days_in_month(start_year, start_month)
+        start_day = min(reset_day, prev_max_day)
+    else:
+        start_year, start_month, start_day = year, month, actual_reset_day
+
+    # Period ends at next month's reset
+    if start_month == 12:
+        end_year, end_month = start_year + 1, 1
     else:
-        return dt.astimezone(target_tz)
+        end_year, end_month = start_year, start_month + 1
+    end_day = min(reset_day, _days_in_month(end_year, end_month))
+
+    return start_year, start_month, start_day, end_year, end_month, end_day
 
 
 class BillingPeriodCalculator:
@@ -56,15 +120,44 @@ class BillingPeriodCalculator:
         
         # Set up timezone
         try:
-            if user_timezone == "UTC":
-                self.user_tz = timezone.utc
-            else:
-                import pytz
-                self.user_tz = pytz.timezone(user_timezone)
+            self.user_tz = _resolve_timezone(user_timezone)
         except Exception:
             logger.warning(f"Invalid timezone {user_timezone}, using UTC")
             self.user_tz = timezone.utc
 
+        # Resolve the naive-datetime attachment strategy once: pytz
+        # timezones need localize(), stdlib tzinfo uses replace().
+        if hasattr(self.user_tz, "localize"):
+            self._attach_tz = self.user_tz.localize
+        else:
+            self._attach_tz = lambda dt: dt.replace(tzinfo=self.user_tz)
+        self._tz_is_utc = self.user_tz is timezone.utc
+
+        # Memoized period boundaries, keyed by the date components that
+        # actually determine them (see _boundary_cache_key).
+        self._boundary_cache: dict = {}
+
+        # Last period returned by get_current_period; consecutive calls
+        # usually fall inside the same period and skip recomputation.
+        self._cached_period: Optional[BillingPeriod] = None
+
+    def _ensure_tz(self, dt: datetime) -> datetime:
+        """Coerce dt into the calculator's timezone.
+
+        Uses the attachment strategy resolved at construction time instead
+        of re-checking hasattr(tz, 'localize') on every call. Datetimes
+        already in the calculator's timezone (or any UTC-equivalent tz when
+        the calculator is UTC) are returned as-is, skipping astimezone.
+        """
+        tzinfo = dt.tzinfo
+        if tzinfo is None:
+            return self._attach_tz(dt)
+        if tzinfo is self.user_tz or (
+            self._tz_is_utc and tzinfo.utcoffset(dt) == _ZERO_OFFSET
+        ):
+            return dt
+        return dt.astimezone(self.user_tz)
+
     def get_current_period(self, reference_time: Optional[datetime] = None) -> BillingPeriod:
         """Get the current billing period.
 
@@ -77,16 +170,22 @@ class BillingPeriodCalculator:
         if reference_time is None:
             reference_time = datetime.now(self.user_tz)
         else:
-            reference_time = _ensure_timezone(reference_time, self.user_tz)
+            reference_time = self._ensure_tz(reference_time)
+
+        cached = self._cached_period
+        if cached is not None and cached.start_time <= reference_time < cached.end_time:
+            return cached
 
         start_time, end_time = self._calculate_period_boundaries(reference_time)
-        
-        return BillingPeriod(
+
+        period = BillingPeriod(
             period_type=self.period_type,
             start_time=start_time,
             end_time=end_time,
             is_current=True,
         )
+        self._cached_period = period
+        return period
 
     def get_period_for_timestamp(self, timestamp: datetime) -> BillingPeriod:
         """Get the billing period that contains the given timestamp.
@@ -97,12 +196,22 @@ class BillingPeriodCalculator:
         Returns:
             BillingPeriod containing the timestamp
         """
-        timestamp = _ensure_timezone(timestamp, self.user_tz)
+        timestamp = self._ensure_tz(timestamp)
+        return self._get_period_for_timestamp(timestamp, datetime.now(self.user_tz))
+
+    def _get_period_for_timestamp(self, timestamp: datetime, now: datetime) -> BillingPeriod:
+        """Build the period containing timestamp using a pre-computed clock.
+
+        Args:
+            timestamp: Timezone-aware timestamp to find the period for
+            now: Pre-computed current time used to flag the current period
+
+        Returns:
+            BillingPeriod containing the timestamp
+        """
         start_time, end_time = self._calculate_period_boundaries(timestamp)
-        
-        now = datetime.now(self.user_tz)
         is_current = start_time <= now < end_time
-        
+
         return BillingPeriod(
             period_type=self.period_type,
             start_time=start_time,
@@ -124,20 +233,83 @@ class BillingPeriodCalculator:
         Returns:
             List of BillingPeriod objects, most recent first
         """
+        if count <= 0:
+            return []
+
         if reference_time is None:
             reference_time = datetime.now(self.user_tz)
         else:
-            reference_time = _ensure_timezone(reference_time, self.user_tz)
-
-        periods = []
-        current_ref = reference_time
-
-        for i in range(count):
-            period = self.get_period_for_timestamp(current_ref)
+            reference_time = self._ensure_tz(reference_time)
+
+        first = self._get_period_for_timestamp(reference_time, reference_time)
+        periods = [first]
+
+        # Fixed-offset timezones have no DST transitions, so previous daily
+        # and weekly periods are exactly one constant delta earlier — no
+        # need to rerun the boundary calculation per period.
+        step = None
+        if isinstance(self.user_tz, timezone):
+            if self.period_type == BillingPeriodType.DAILY:
+                step = timedelta(days=1)
+            elif self.period_type == BillingPeriodType.WEEKLY:
+                step = timedelta(days=7)
+
+        if step is not None:
+            start_time = first.start_time
+            end_time = first.end_time
+            for _ in range(count - 1):
+                start_time -= step
+                end_time -= step
+                periods.append(
+                    BillingPeriod(
+                        period_type=self.period_type,
+                        start_time=start_time,
+                        end_time=end_time,
+                        is_current=False,
+                    )
+                )
+            return periods
+
+        # Monthly periods in a fixed-offset timezone step backwards in
+        # pure year/month integer arithmetic: each period ends where the
+        # one after it starts, so only the new start day needs computing.
+        if self.period_type == BillingPeriodType.MONTHLY and isinstance(
+            self.user_tz, timezone
+        ):
+            reset_day = self.reset_day if self.reset_day is not None else 1
+            start_time = first.start_time
+            year, month = start_time.year, start_time.month
+            for _ in range(count - 1):
+                end_time = start_time
+                if month == 1:
+                    year, month = year - 1, 12
+                else:
+                    month -= 1
+                start_time = start_time.replace(
+                    year=year,
+                    month=month,
+                    day=min(reset_day, _days_in_month(year, month)),
+                )
+                periods.append(
+                    BillingPeriod(
+                        period_type=self.period_type,
+                        start_time=start_time,
+                        end_time=end_time,
+                        is_current=False,
+                    )
+                )
+            return periods
+
+        # pytz arithmetic does not renormalize offsets, so each probe is
+        # re-localized via _ensure_tz before it crosses a DST transition
+        # with a stale offset attached.
+        current_ref = self._ensure_tz(first.start_time - timedelta(seconds=1))
+        for _ in range(count - 1):
+            period = self._get_period_for_timestamp(current_ref, reference_time)
             periods.append(period)
-            
+
             # Move to previous period
-            current_ref = period.start_time - timedelta(seconds=1)
+            current_ref = self._ensure_tz(period.start_time - timedelta(seconds=1))
 
         return periods
 
@@ -155,13 +327,170 @@ class BillingPeriodCalculator:
         Returns:
             BillingPeriodSummary with aggregated data
         """
+        # Many small blocks never individually reach the per-block NumPy
+        # threshold; route them through the shared-array batch path so the
+        # aggregation still happens in C-level reductions.
+        if (
+            len(session_blocks) > 1
+            and sum(len(block.entries) for block in session_blocks)
+            >= _VECTORIZE_MIN_ENTRIES
+        ):
+            return self.summarize_batch([period], session_blocks)[0]
+
         summary = BillingPeriodSummary(period=period)
-        
+
         for session_block in session_blocks:
             summary.add_session_block(session_block)
-        
+
         return summary
 
+    def summarize_batch(
+        self,
+        periods: List[BillingPeriod],
+        session_blocks: List[SessionBlock],
+    ) -> List[BillingPeriodSummary]:
+        """Create summaries for many billing periods in one pass.
+
+        Summarizing P periods with create_period_summary scans every
+        block's entries P times. This sorts all entry timestamps once and
+        slices each period out of the shared arrays with np.searchsorted,
+        so the work drops from O(P*N) to O(N log N + P log N).
+
+        Args:
+            periods: Billing periods to summarize
+            session_blocks: Session blocks shared by all periods
+
+        Returns:
+            BillingPeriodSummary list in the same order as periods
+        """
+        if not periods:
+            return []
+        if sum(len(block.entries) for block in session_blocks) < _VECTORIZE_MIN_ENTRIES:
+            return [
+                self.create_period_summary(period, session_blocks)
+                for period in periods
+            ]
+
+        import numpy as np
+
+        # Concatenate the per-block column arrays, remapping each block's
+        # local model indices into a shared table and tagging every entry
+        # with its block index so summaries can list their source blocks.
+        ts_parts = []
+        token_parts = ([], [], [], [])
+        cost_parts = []
+        model_parts = []
+        block_parts = []
+        model_table: List[str] = []
+        model_indices = {}
+        for block_index, block in enumerate(session_blocks):
+            (
+                ts_ns,
+                input_tokens,
+                output_tokens,
+                cache_creation,
+                cache_read,
+                costs,
+                model_idx,
+                local_table,
+            ) = block._get_entry_arrays()
+            if not ts_ns.size:
+                continue
+            remap = np.empty(len(local_table), dtype=np.int32)
+            for local_index, model in enumerate(local_table):
+                shared = model_indices.get(model)
+                if shared is None:
+                    shared = len(model_table)
+                    model_indices[model] = shared
+                    model_table.append(model)
+                remap[local_index] = shared
+            ts_parts.append(ts_ns)
+            for part, column in zip(
+                token_parts, (input_tokens, output_tokens, cache_creation, cache_read)
+            ):
+                part.append(column)
+            cost_parts.append(costs)
+            model_parts.append(remap[model_idx])
+            block_parts.append(np.full(ts_ns.size, block_index, dtype=np.int32))
+
+        all_ts = np.concatenate(ts_parts)
+        order = np.argsort(all_ts, kind="stable")
+        all_ts = all_ts[order]
+        all_models = np.concatenate(model_parts)[order]
+        all_blocks = np.concatenate(block_parts)[order]
+        all_costs = np.concatenate(cost_parts)[order]
+        entries_sorted = [
+            entry for block in session_blocks for entry in block.entries
+        ]
+        entries_sorted = [entries_sorted[i] for i in order]
+
+        # Prefix sums turn every per-period token/cost reduction into two
+        # array lookups once searchsorted has located the slice.
+        cost_micros = np.rint(all_costs * 1_000_000).astype(np.int64)
+        cost_prefix = np.concatenate(
+            [np.zeros(1, dtype=np.int64), np.cumsum(cost_micros)]
+        )
+        token_prefixes = []
+        for part in token_parts:
+            column = np.concatenate(part)[order]
+            token_prefixes.append(
+                np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(column)])
+            )
+
+        starts = np.array([period.start_ns for period in periods], dtype=np.int64)
+        ends = np.array([period.end_ns for period in periods], dtype=np.int64)
+        lo = np.searchsorted(all_ts, starts, side="left")
+        hi = np.searchsorted(all_ts, ends, side="left")
+
+        summaries = []
+        for index, period in enumerate(periods):
+            summary = BillingPeriodSummary(period=period)
+            summaries.append(summary)
+            start, stop = int(lo[index]), int(hi[index])
+            if stop <= start:
+                continue
+
+            summary._cost_micros = int(cost_prefix[stop] - cost_prefix[start])
+            token_counts = summary.token_counts
+            token_counts.input_tokens = int(
+                token_prefixes[0][stop] - token_prefixes[0][start]
+            )
+            token_counts.output_tokens = int(
+                token_prefixes[1][stop] - token_prefixes[1][start]
+            )
+            token_counts.cache_creation_tokens = int(
+                token_prefixes[2][stop] - token_prefixes[2][start]
+            )
+            token_counts.cache_read_tokens = int(
+                token_prefixes[3][stop] - token_prefixes[3][start]
+            )
+            summary.entries_count = stop - start
+
+            model_costs = np.bincount(
+                all_models[start:stop],
+                weights=all_costs[start:stop],
+                minlength=len(model_table),
+            )
+            for model_index in np.flatnonzero(
+                np.bincount(all_models[start:stop], minlength=len(model_table))
+            ):
+                model = model_table[model_index]
+                if model and model not in summary._models_seen:
+                    summary._models_seen.add(model)
+                    summary.models_used.append(model)
+                summary.per_model_costs[model] = float(model_costs[model_index])
+
+            summary.session_blocks = [
+                session_blocks[block_index]
+                for block_index in np.unique(all_blocks[start:stop])
+            ]
+            # Entries are globally time-sorted, so the slice ends are the
+            # first and last usage within the period.
+            summary.first_usage = entries_sorted[start].timestamp
+            summary.last_usage = entries_sorted[stop - 1].timestamp
+
+        return summaries
+
     def _calculate_period_boundaries(self, reference_time: datetime) -> Tuple[datetime, datetime]:
         """Calculate start and end times for a billing period containing reference_time.
 
@@ -171,16 +500,51 @@ class BillingPeriodCalculator:
         Returns:
             Tuple of (start_time, end_time) for the period
         """
-        if self.period_type == BillingPeriodType.DAILY:
-            return self._calculate_daily_boundaries(reference_time)
-        elif self.period_type == BillingPeriodType.WEEKLY:
-            return self._calculate_weekly_boundaries(reference_time)
-        elif self.period_type == BillingPeriodType.MONTHLY:
-            return self._calculate_monthly_boundaries(reference_time)
-        elif self.period_type == BillingPeriodType.CUSTOM:
-            return self._calculate_custom_boundaries(reference_time)
-        else:
+        key = self._boundary_cache_key(reference_time)
+        if key is not None:
+            cached = self._boundary_cache.get(key)
+            if cached is not None:
+                return cached
+
+        boundaries = self._compute_period_boundaries(reference_time)
+        if key is not None:
+            if len(self._boundary_cache) >= 1024:
+                self._boundary_cache.clear()
+            self._boundary_cache[key] = boundaries
+        return boundaries
+
+    def _boundary_cache_key(self, reference_time: datetime) -> Optional[tuple]:
+        """Build a cache key for period boundaries, or None if not cacheable.
+
+        Daily, weekly and monthly boundaries depend only on the date of the
+        reference time (plus, for daily periods with a reset hour, whether
+        the reference falls before that hour). The UTC offset is part of
+        the key because the computed boundaries inherit the reference's
+        tzinfo — without it, a reference carrying a stale pytz offset
+        would poison the cache for correctly-localized lookups of the
+        same date. Custom periods depend on the full timestamp relative
+        to the custom start date, so they are not memoized.
+        """
+        if self.period_type == BillingPeriodType.CUSTOM:
+            return None
+
+        key: tuple = (
+            reference_time.year,
+            reference_time.month,
+            reference_time.day,
+            reference_time.utcoffset(),
+        )
+        if self.period_type == BillingPeriodType.DAILY and self.reset_day:
+            key += (reference_time.hour < self.reset_day,)
+        return key
+
+    def _compute_period_boundaries(self, reference_time: datetime) -> Tuple[datetime, datetime]:
+        """Compute period boundaries without consulting the cache."""
+        try:
+            handler = self._BOUNDARY_DISPATCH[self.period_type]
+        except KeyError:
             raise ValueError(f"Unsupported period type: {self.period_type}")
+        return handler(self, reference_time)
 
     def _calculate_daily_boundaries(self, reference_time: datetime) -> Tuple[datetime, datetime]:
         """Calculate daily period boundaries."""
@@ -224,50 +588,17 @@ class BillingPeriodCalculator:
         """Calculate monthly period boundaries."""
         # Reset on 1st or custom day of month
         reset_day = self.reset_day if self.reset_day is not None else 1
-        
-        # Ensure reset_day is valid for the month
-        max_day = calendar.monthrange(reference_time.year, reference_time.month)[1]
-        actual_reset_day = min(reset_day, max_day)
-        
-        # If we're before the reset day this month, use last month's reset
-        if reference_time.day < actual_reset_day:
-            # Go to previous month
-            if reference_time.month == 1:
-                prev_year = reference_time.year - 1
-                prev_month = 12
-            else:
-                prev_year = reference_time.year  
-                prev_month = reference_time.month - 1
-                
-            # Ensure reset day is valid for previous month
-            prev_max_day = calendar.monthrange(prev_year, prev_month)[1]
-            prev_reset_day = min(reset_day, prev_max_day)
-            
-            start_time = reference_time.replace(
-                year=prev_year, month=prev_month, day=prev_reset_day,
-                hour=0, minute=0, second=0, microsecond=0
-            )
-        else:
-            # Use this month's reset
-            start_time = reference_time.replace(
-                day=actual_reset_day, hour=0, minute=0, second=0, microsecond=0
-            )
-        
-        # Calculate end time (next month's reset day)
-        if start_time.month == 12:
-            next_year = start_time.year + 1
-            next_month = 1
-        else:
-            next_year = start_time.year
-            next_month = start_time.month + 1
-            
-        next_max_day = calendar.monthrange(next_year, next_month)[1]
-        next_reset_day = min(reset_day, next_max_day)
-        
-        end_time = start_time.replace(
-            year=next_year, month=next_month, day=next_reset_day
+
+        start_y, start_m, start_d, end_y, end_m, end_d = _month_bounds(
+            reference_time.year, reference_time.month, reference_time.day, reset_day
         )
-        
+
+        start_time = reference_time.replace(
+            year=start_y, month=start_m, day=start_d,
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        end_time = start_time.replace(year=end_y, month=end_m, day=end_d)
+
         return start_time, end_time
 
     def _calculate_custom_boundaries(self, reference_time: datetime) -> Tuple[datetime, datetime]:
@@ -277,21 +608,31 @@ class BillingPeriodCalculator:
             logger.warning("No custom start date provided, falling back to daily periods")
             return self._calculate_daily_boundaries(reference_time)
         
-        custom_start = _ensure_timezone(self.custom_start_date, self.user_tz)
+        custom_start = self._ensure_tz(self.custom_start_date)
         
         # For custom periods, we need to determine the period duration
         # Default to 30 days if not specified otherwise
         period_duration = timedelta(days=30)
         
-        # Calculate how many periods have passed since the custom start
-        time_since_start = reference_time - custom_start
-        periods_elapsed = int(time_since_start.total_seconds() / period_duration.total_seconds())
-        
+        # Calculate how many periods have passed since the custom start;
+        # timedelta floor division stays in integer microseconds instead
+        # of round-tripping both deltas through float seconds.
+        periods_elapsed = (reference_time - custom_start) // period_duration
+
         start_time = custom_start + (period_duration * periods_elapsed)
         end_time = start_time + period_duration
-        
+
         return start_time, end_time
 
+    # Table dispatch for _compute_period_boundaries: one hash lookup
+    # instead of up to four enum comparisons per boundary calculation.
+    _BOUNDARY_DISPATCH = {
+        BillingPeriodType.DAILY: _calculate_daily_boundaries,
+        BillingPeriodType.WEEKLY: _calculate_weekly_boundaries,
+        BillingPeriodType.MONTHLY: _calculate_monthly_boundaries,
+        BillingPeriodType.CUSTOM: _calculate_custom_boundaries,
+    }
+
     def get_next_reset_time(self, reference_time: Optional[datetime] = None) -> datetime:
         """Get the next billing period reset time.
 
@@ -316,7 +657,7 @@ class BillingPeriodCalculator:
         if reference_time is None:
             reference_time = datetime.now(self.user_tz)
         else:
-            reference_time = _ensure_timezone(reference_time, self.user_tz)
+            reference_time = self._ensure_tz(reference_time)
             
         next_reset = self.get_next_reset_time(reference_time)
         return next_reset - reference_time
\ No newline at end of file
@@ -16,6 +16,7 @@ from claude_monitor.utils.time_utils import TimezoneHandler
 logger: logging.Logger = logging.getLogger(__name__)
 
 _p90_calculator: P90Calculator = P90Calculator()
+_timezone_handler: TimezoneHandler = TimezoneHandler()
 
 
 class BlockLike(Protocol):
@@ -56,9 +57,16 @@ class BurnRateCalculator:
             tokens_per_minute=tokens_per_minute, cost_per_hour=cost_per_hour
         )
 
-    def project_block_usage(self, block: BlockLike) -> Optional[UsageProjection]:
-        """Project total usage if current rate continues."""
-        burn_rate = self.calculate_burn_rate(block)
+    def project_block_usage(
+        self, block: BlockLike, burn_rate: Optional[BurnRate] = None
+    ) -> Optional[UsageProjection]:
+        """Project total usage if current rate continues.
+
+        Callers that already computed the block's burn rate can pass it
+        in to avoid recomputing it here.
+        """
+        if burn_rate is None:
+            burn_rate = self.calculate_burn_rate(block)
         if not burn_rate:
             return None
 
@@ -137,10 +145,9 @@ def _parse_block_start_time(block: Dict[str, Any]) -> Optional[datetime]:
     if not start_time_str:
         return None
 
-    tz_handler = TimezoneHandler()
     try:
-        start_time = tz_handler.parse_timestamp(start_time_str)
-        return tz_handler.ensure_utc(start_time)
+        start_time = _timezone_handler.parse_timestamp(start_time_str)
+        return _timezone_handler.ensure_utc(start_time)
     except (ValueError, TypeError, AttributeError) as e:
         _log_timestamp_error(e, start_time_str, block.get("id"), "start_time")
         return None
@@ -155,10 +162,9 @@ def _determine_session_end_time(
 
     actual_end_str = block.get("actualEndTime")
     if actual_end_str:
-        tz_handler = TimezoneHandler()
         try:
-            session_actual_end = tz_handler.parse_timestamp(actual_end_str)
-            return tz_handler.ensure_utc(session_actual_end)
+            session_actual_end = _timezone_handler.parse_timestamp(actual_end_str)
+            return _timezone_handler.ensure_utc(session_actual_end)
         except (ValueError, TypeError, AttributeError) as e:
             _log_timestamp_error(e, actual_end_str, block.get("id"), "actual_end_time")
     return current_time
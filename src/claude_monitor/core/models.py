@@ -2,10 +2,28 @@
 Core data structures for usage tracking, session management, and token calculations.
 """
 
+import re
+import sys
+
+from bisect import bisect_left
+from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+# Entry count above which summary aggregation switches from the plain
+# Python loop to the NumPy column arrays cached on SessionBlock.
+_VECTORIZE_MIN_ENTRIES = 64
+
+# __slots__ roughly halves per-instance memory for the hot leaf records
+# (millions of UsageEntry objects on large histories) and turns attribute
+# access into a slot load; dataclass support for it needs Python 3.10+.
+if sys.version_info >= (3, 10):
+    _SLOTTED = {"slots": True}
+else:  # pragma: no cover - Python 3.9 fallback
+    _SLOTTED: Dict[str, bool] = {}
 
 
 class CostMode(Enum):
@@ -25,7 +43,7 @@ class BillingPeriodType(Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class UsageEntry:
     """Individual usage record from Claude usage data."""
 
@@ -38,9 +56,23 @@ class UsageEntry:
     model: str = ""
     message_id: str = ""
     request_id: str = ""
+    _timestamp_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO string for timestamp, formatted once per entry.
 
-@dataclass
+        Serialization re-emits every entry on each refresh; the
+        timestamp never mutates, so format it a single time.
+        """
+        if self._timestamp_iso is None:
+            self._timestamp_iso = self.timestamp.isoformat()
+        return self._timestamp_iso
+
+
+@dataclass(**_SLOTTED)
 class TokenCounts:
     """Token aggregation structure with computed totals."""
 
@@ -60,7 +92,7 @@ class TokenCounts:
         )
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class BurnRate:
     """Token consumption rate metrics."""
 
@@ -68,7 +100,7 @@ class BurnRate:
     cost_per_hour: float
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class UsageProjection:
     """Usage projection calculations for active blocks."""
 
@@ -97,6 +129,107 @@ class SessionBlock:
     limit_messages: List[Dict[str, Any]] = field(default_factory=list)
     projection_data: Optional[Dict[str, Any]] = None
     burn_rate_snapshot: Optional[BurnRate] = None
+    _entry_arrays: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _sorted_timestamps_cache: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _start_time_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _end_time_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def start_time_iso(self) -> str:
+        """ISO string for start_time, formatted once per block."""
+        if self._start_time_iso is None:
+            self._start_time_iso = self.start_time.isoformat()
+        return self._start_time_iso
+
+    @property
+    def end_time_iso(self) -> str:
+        """ISO string for end_time, formatted once per block.
+
+        actual_end_time is deliberately not cached this way: it moves
+        forward while a block is active.
+        """
+        if self._end_time_iso is None:
+            self._end_time_iso = self.end_time.isoformat()
+        return self._end_time_iso
+
+    def _sorted_entry_timestamps(self) -> Optional[List[datetime]]:
+        """Entry timestamps if entries are already time-sorted, else None.
+
+        Entries within a block are normally appended in chronological order,
+        which lets period filtering use bisect instead of a linear scan. The
+        result is cached and rebuilt if entries were appended since.
+        """
+        cached = self._sorted_timestamps_cache
+        if cached is not None and cached[1] == len(self.entries):
+            return cached[0]
+
+        timestamps: Optional[List[datetime]] = [
+            entry.timestamp for entry in self.entries
+        ]
+        if any(a > b for a, b in zip(timestamps, timestamps[1:])):
+            timestamps = None
+        self._sorted_timestamps_cache = (timestamps, len(self.entries))
+        return timestamps
+
+    def _get_entry_arrays(self) -> tuple:
+        """Lazily build column arrays over entries for vectorized aggregation.
+
+        Returns a tuple of NumPy arrays (timestamps as int64 nanoseconds,
+        the four token columns, costs, model indices) plus the model lookup
+        table. The cache is rebuilt if entries were appended since the last
+        build.
+        """
+        import numpy as np
+
+        cached = self._entry_arrays
+        if cached is not None and len(cached[0]) == len(self.entries):
+            return cached
+
+        count = len(self.entries)
+        ts_ns = np.empty(count, dtype=np.int64)
+        input_tokens = np.empty(count, dtype=np.int64)
+        output_tokens = np.empty(count, dtype=np.int64)
+        cache_creation = np.empty(count, dtype=np.int64)
+        cache_read = np.empty(count, dtype=np.int64)
+        costs = np.empty(count, dtype=np.float64)
+        model_idx = np.empty(count, dtype=np.int32)
+
+        model_table: List[str] = []
+        model_indices: Dict[str, int] = {}
+
+        for i, entry in enumerate(self.entries):
+            ts_ns[i] = int(entry.timestamp.timestamp() * 1e9)
+            input_tokens[i] = entry.input_tokens
+            output_tokens[i] = entry.output_tokens
+            cache_creation[i] = entry.cache_creation_tokens
+            cache_read[i] = entry.cache_read_tokens
+            costs[i] = entry.cost_usd
+            index = model_indices.get(entry.model)
+            if index is None:
+                index = len(model_table)
+                model_indices[entry.model] = index
+                model_table.append(entry.model)
+            model_idx[i] = index
+
+        self._entry_arrays = (
+            ts_ns,
+            input_tokens,
+            output_tokens,
+            cache_creation,
+            cache_read,
+            costs,
+            model_idx,
+            model_table,
+        )
+        return self._entry_arrays
 
     @property
     def total_tokens(self) -> int:
@@ -118,7 +251,7 @@ class SessionBlock:
         return max(duration, 1.0)
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class BillingPeriod:
     """Represents a billing period with its boundaries and metadata."""
 
@@ -127,28 +260,42 @@ class BillingPeriod:
     end_time: datetime
     is_current: bool = False
     custom_label: Optional[str] = None
+    start_ns: int = field(init=False, repr=False, compare=False)
+    end_ns: int = field(init=False, repr=False, compare=False)
+    _duration_seconds: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Boundaries never mutate, so precompute integer nanosecond
+        # timestamps for cheap comparisons against entry timestamp arrays,
+        # and the duration used by the derived properties below.
+        self.start_ns = int(self.start_time.timestamp() * 1e9)
+        self.end_ns = int(self.end_time.timestamp() * 1e9)
+        self._duration_seconds = (self.end_time - self.start_time).total_seconds()
 
     @property
     def duration_days(self) -> float:
         """Get duration in days."""
-        return (self.end_time - self.start_time).total_seconds() / (24 * 3600)
+        return self._duration_seconds / (24 * 3600)
 
     @property
     def duration_hours(self) -> float:
         """Get duration in hours."""
-        return (self.end_time - self.start_time).total_seconds() / 3600
+        return self._duration_seconds / 3600
 
     def contains_timestamp(self, timestamp: datetime) -> bool:
         """Check if timestamp falls within this billing period."""
         return self.start_time <= timestamp < self.end_time
 
+    def contains_ns(self, ns: int) -> bool:
+        """Check if an int64 nanosecond timestamp falls within this period."""
+        return self.start_ns <= ns < self.end_ns
+
 
 @dataclass
 class BillingPeriodSummary:
     """Summary of usage and costs within a billing period."""
 
     period: BillingPeriod
-    total_cost: float = 0.0
     total_tokens: int = 0
     token_counts: TokenCounts = field(default_factory=TokenCounts)
     session_blocks: List[SessionBlock] = field(default_factory=list)
@@ -157,6 +304,25 @@ class BillingPeriodSummary:
     per_model_costs: Dict[str, float] = field(default_factory=dict)
     first_usage: Optional[datetime] = None
     last_usage: Optional[datetime] = None
+    _models_seen: Set[str] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    # Costs accumulate as integer micro-dollars so repeated additions stay
+    # bit-exact; total_cost derives the float USD view on read.
+    _cost_micros: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._models_seen.update(self.models_used)
+
+    @property
+    def total_cost(self) -> float:
+        """Total cost in USD."""
+        return self._cost_micros / 1_000_000
+
+    @property
+    def total_cost_micros(self) -> int:
+        """Total cost in integer micro-dollars (exact)."""
+        return self._cost_micros
 
     @property
     def average_cost_per_day(self) -> float:
@@ -178,60 +344,147 @@ class BillingPeriodSummary:
             return 100.0
             
         elapsed = (now - self.period.start_time).total_seconds()
-        total = (self.period.end_time - self.period.start_time).total_seconds()
-        return (elapsed / total) * 100.0
+        return (elapsed / self.period._duration_seconds) * 100.0
 
     def add_session_block(self, session_block: SessionBlock) -> None:
         """Add a session block to this billing period summary."""
-        # Only include entries that fall within the billing period
-        relevant_entries = [
-            entry for entry in session_block.entries
-            if self.period.contains_timestamp(entry.timestamp)
-        ]
-        
-        if not relevant_entries:
+        if len(session_block.entries) >= _VECTORIZE_MIN_ENTRIES:
+            self._add_session_block_vectorized(session_block)
             return
-            
+
+        # Slice via bisect when entries are time-sorted; otherwise test
+        # each entry against the boundaries inside the aggregation loop.
+        period_start = self.period.start_time
+        period_end = self.period.end_time
+        timestamps = session_block._sorted_entry_timestamps()
+        if timestamps is not None:
+            lo = bisect_left(timestamps, period_start)
+            hi = bisect_left(timestamps, period_end)
+            entries = session_block.entries[lo:hi]
+            check_range = False
+        else:
+            entries = session_block.entries
+            check_range = True
+
+        # Single fused pass: tokens, cost, models and first/last usage are
+        # all accumulated into locals and flushed to the summary once.
+        input_tokens = 0
+        output_tokens = 0
+        cache_creation = 0
+        cache_read = 0
+        cost_micros = 0
+        count = 0
+        earliest: Optional[datetime] = None
+        latest: Optional[datetime] = None
+        local_model_costs: Dict[str, float] = defaultdict(float)
+        models_seen = self._models_seen
+        models_used = self.models_used
+
+        for entry in entries:
+            timestamp = entry.timestamp
+            if check_range and not (period_start <= timestamp < period_end):
+                continue
+            cost = entry.cost_usd
+
+            count += 1
+            cost_micros += int(round(cost * 1_000_000))
+            input_tokens += entry.input_tokens
+            output_tokens += entry.output_tokens
+            cache_creation += entry.cache_creation_tokens
+            cache_read += entry.cache_read_tokens
+
+            model = entry.model
+            if model and model not in models_seen:
+                models_seen.add(model)
+                models_used.append(model)
+            local_model_costs[model] += cost
+
+            if earliest is None or timestamp < earliest:
+                earliest = timestamp
+            if latest is None or timestamp > latest:
+                latest = timestamp
+
+        if not count:
+            return
+
         self.session_blocks.append(session_block)
-        
-        # Aggregate costs and tokens from relevant entries
-        period_cost = 0.0
-        period_tokens = TokenCounts()
-        
-        for entry in relevant_entries:
-            period_cost += entry.cost_usd
-            period_tokens.input_tokens += entry.input_tokens
-            period_tokens.output_tokens += entry.output_tokens
-            period_tokens.cache_creation_tokens += entry.cache_creation_tokens
-            period_tokens.cache_read_tokens += entry.cache_read_tokens
-            
-            # Track model usage
-            if entry.model and entry.model not in self.models_used:
-                self.models_used.append(entry.model)
-                
-            # Track per-model costs
-            if entry.model in self.per_model_costs:
-                self.per_model_costs[entry.model] += entry.cost_usd
-            else:
-                self.per_model_costs[entry.model] = entry.cost_usd
-        
-        self.total_cost += period_cost
-        self.token_counts.input_tokens += period_tokens.input_tokens
-        self.token_counts.output_tokens += period_tokens.output_tokens
-        self.token_counts.cache_creation_tokens += period_tokens.cache_creation_tokens
-        self.token_counts.cache_read_tokens += period_tokens.cache_read_tokens
-        self.entries_count += len(relevant_entries)
-        
+
+        for model, cost in local_model_costs.items():
+            self.per_model_costs[model] = self.per_model_costs.get(model, 0.0) + cost
+
+        self._cost_micros += cost_micros
+        token_counts = self.token_counts
+        token_counts.input_tokens += input_tokens
+        token_counts.output_tokens += output_tokens
+        token_counts.cache_creation_tokens += cache_creation
+        token_counts.cache_read_tokens += cache_read
+        self.entries_count += count
+
         # Update first/last usage timestamps
-        entry_timestamps = [entry.timestamp for entry in relevant_entries]
-        if entry_timestamps:
-            earliest = min(entry_timestamps)
-            latest = max(entry_timestamps)
-            
-            if self.first_usage is None or earliest < self.first_usage:
-                self.first_usage = earliest
-            if self.last_usage is None or latest > self.last_usage:
-                self.last_usage = latest
+        if self.first_usage is None or earliest < self.first_usage:
+            self.first_usage = earliest
+        if self.last_usage is None or latest > self.last_usage:
+            self.last_usage = latest
+
+    def _add_session_block_vectorized(self, session_block: SessionBlock) -> None:
+        """NumPy fast path of add_session_block for blocks with many entries.
+
+        Filters and aggregates the block's cached column arrays with masked
+        C-level reductions instead of a per-entry Python loop.
+        """
+        import numpy as np
+
+        (
+            ts_ns,
+            input_tokens,
+            output_tokens,
+            cache_creation,
+            cache_read,
+            costs,
+            model_idx,
+            model_table,
+        ) = session_block._get_entry_arrays()
+
+        mask = (ts_ns >= self.period.start_ns) & (ts_ns < self.period.end_ns)
+        relevant_indices = np.flatnonzero(mask)
+        if relevant_indices.size == 0:
+            return
+
+        self.session_blocks.append(session_block)
+
+        # Round each entry to micro-dollars before summing to match the
+        # scalar path exactly.
+        self._cost_micros += int(np.rint(costs[mask] * 1_000_000).sum())
+        self.token_counts.input_tokens += int(input_tokens[mask].sum())
+        self.token_counts.output_tokens += int(output_tokens[mask].sum())
+        self.token_counts.cache_creation_tokens += int(cache_creation[mask].sum())
+        self.token_counts.cache_read_tokens += int(cache_read[mask].sum())
+        self.entries_count += int(relevant_indices.size)
+
+        model_costs = np.bincount(
+            model_idx[mask], weights=costs[mask], minlength=len(model_table)
+        )
+        model_counts = np.bincount(model_idx[mask], minlength=len(model_table))
+        for index, model in enumerate(model_table):
+            if not model_counts[index]:
+                continue
+            if model and model not in self._models_seen:
+                self._models_seen.add(model)
+                self.models_used.append(model)
+            if model in self.per_model_costs:
+                self.per_model_costs[model] += float(model_costs[index])
+            else:
+                self.per_model_costs[model] = float(model_costs[index])
+
+        relevant_ts = ts_ns[relevant_indices]
+        entries = session_block.entries
+        earliest = entries[int(relevant_indices[relevant_ts.argmin()])].timestamp
+        latest = entries[int(relevant_indices[relevant_ts.argmax()])].timestamp
+
+        if self.first_usage is None or earliest < self.first_usage:
+            self.first_usage = earliest
+        if self.last_usage is None or latest > self.last_usage:
+            self.last_usage = latest
 
     @property
     def total_tokens_calculated(self) -> int:
@@ -239,6 +492,13 @@ class BillingPeriodSummary:
         return self.token_counts.total_tokens
 
 
+# Claude 4-series names pass through unchanged; one scan instead of six
+# substring checks per call.
+_MODEL_4_SERIES_RE = re.compile(r"(?:opus|sonnet|haiku)-4-")
+_MODEL_3_5_RE = re.compile(r"3[.-]5")
+
+
+@lru_cache(maxsize=256)
 def normalize_model_name(model: str) -> str:
     """Normalize model name for consistent usage across the application.
 
@@ -262,14 +522,7 @@ def normalize_model_name(model: str) -> str:
 
     model_lower = model.lower()
 
-    if (
-        "claude-opus-4-" in model_lower
-        or "claude-sonnet-4-" in model_lower
-        or "claude-haiku-4-" in model_lower
-        or "sonnet-4-" in model_lower
-        or "opus-4-" in model_lower
-        or "haiku-4-" in model_lower
-    ):
+    if _MODEL_4_SERIES_RE.search(model_lower):
         return model_lower
 
     if "opus" in model_lower:
@@ -279,11 +532,11 @@ def normalize_model_name(model: str) -> str:
     if "sonnet" in model_lower:
         if "4-" in model_lower:
             return model_lower
-        if "3.5" in model_lower or "3-5" in model_lower:
+        if _MODEL_3_5_RE.search(model_lower):
             return "claude-3-5-sonnet"
         return "claude-3-sonnet"
     if "haiku" in model_lower:
-        if "3.5" in model_lower or "3-5" in model_lower:
+        if _MODEL_3_5_RE.search(model_lower):
             return "claude-3-5-haiku"
         return "claude-3-haiku"
 
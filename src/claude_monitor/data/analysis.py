@@ -3,9 +3,15 @@ Usage analysis functionality for Claude Monitor.
 Contains the main analyze_usage function and related analysis components.
 """
 
+import asyncio
 import logging
+import threading
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from claude_monitor.core.billing_periods import BillingPeriodCalculator
 from claude_monitor.core.calculations import BurnRateCalculator
@@ -19,9 +25,49 @@ from claude_monitor.core.models import (
 from claude_monitor.data.analyzer import SessionAnalyzer
 from claude_monitor.data.reader import load_usage_entries
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    import json
+
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize one JSON fragment to bytes, via orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+# Cached analyze_usage results keyed by (hours_back, data_path, quick_start),
+# each stored with the data directory mtime stamp it was computed from.
+_ANALYZE_CACHE: Dict[tuple, Tuple[int, Dict[str, Any]]] = {}
+_ANALYZE_CACHE_LOCK = threading.Lock()
+
+# Billing usage sections keyed by (block count, last block actual end
+# time, last block entry count); new entries in the active block move
+# actualEndTime/entries_count, so the totals recompute as data arrives.
+_BILLING_USAGE_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+
+def _data_files_stamp(data_path: Optional[str]) -> Optional[int]:
+    """Get the newest st_mtime_ns across JSONL files under data_path.
+
+    Returns None when the directory has no JSONL files or cannot be
+    scanned, which disables caching for that call.
+    """
+    base = Path(data_path or "~/.claude/projects").expanduser()
+    try:
+        stamps = [path.stat().st_mtime_ns for path in base.rglob("*.jsonl")]
+    except OSError:
+        return None
+    return max(stamps) if stamps else None
+
+
 def analyze_usage(
     hours_back: Optional[int] = 96,
     use_cache: bool = True,
@@ -57,6 +103,47 @@ def analyze_usage(
     elif quick_start:
         logger.info(f"Quick start mode: loading last {hours_back} hours")
 
+    # The UI refresh loop calls this repeatedly with identical arguments;
+    # when no JSONL file changed since the last run, reuse that result.
+    signature = (hours_back, data_path, quick_start)
+    stamp = _data_files_stamp(data_path) if use_cache else None
+    if stamp is not None:
+        with _ANALYZE_CACHE_LOCK:
+            cached = _ANALYZE_CACHE.get(signature)
+        if cached is not None and cached[0] == stamp:
+            logger.info("analyze_usage returning cached result (data unchanged)")
+            # Top-level copy: callers attach keys (e.g. billing_periods)
+            # to the result, which must not leak into the cache.
+            return dict(cached[1])
+
+    blocks, entries, metadata = _load_and_analyze(
+        hours_back, use_cache, quick_start, data_path
+    )
+
+    result = _create_result(blocks, entries, metadata)
+    if stamp is not None:
+        with _ANALYZE_CACHE_LOCK:
+            _ANALYZE_CACHE[signature] = (stamp, result)
+        result = dict(result)
+    logger.info(f"analyze_usage returning {len(result['blocks'])} blocks")
+    return result
+
+
+def _load_and_analyze(
+    hours_back: Optional[int],
+    use_cache: bool,
+    quick_start: bool,
+    data_path: Optional[str],
+) -> Tuple[List[SessionBlock], List[UsageEntry], Dict[str, Any]]:
+    """Run the load/block/limit pipeline on raw objects.
+
+    Keeps SessionBlock objects as the working representation;
+    _create_result is the JSON-serialization boundary applied by the
+    entry points once the analysis is done.
+
+    Returns:
+        Tuple of (blocks, entries, metadata)
+    """
     start_time = datetime.now()
     entries, raw_entries = load_usage_entries(
         data_path=data_path,
@@ -80,15 +167,8 @@ def analyze_usage(
     if raw_entries:
         limit_detections = analyzer.detect_limits(raw_entries)
         limits_detected = len(limit_detections)
-
-        for block in blocks:
-            block_limits = [
-                _format_limit_info(limit_info)
-                for limit_info in limit_detections
-                if _is_limit_in_block_timerange(limit_info, block)
-            ]
-            if block_limits:
-                block.limit_messages = block_limits
+        if limit_detections:
+            _assign_limits_to_blocks(limit_detections, blocks)
 
     metadata: Dict[str, Any] = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -102,9 +182,97 @@ def analyze_usage(
         "quick_start": quick_start,
     }
 
-    result = _create_result(blocks, entries, metadata)
-    logger.info(f"analyze_usage returning {len(result['blocks'])} blocks")
-    return result
+    return blocks, entries, metadata
+
+
+def analyze_usage_to_file(
+    path: str,
+    hours_back: Optional[int] = 96,
+    use_cache: bool = True,
+    quick_start: bool = False,
+    data_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Analyze usage and stream the result JSON to a file.
+
+    Serializes one block at a time instead of materializing the full
+    result dict first, keeping peak memory flat on large histories; block
+    entries are written in the columnar layout (one list per field).
+    Uses orjson when installed, falling back to the stdlib encoder.
+
+    Args:
+        path: Destination file for the result JSON
+        hours_back: Only analyze data from last N hours (None = all data)
+        use_cache: Use cached data when available
+        quick_start: Use minimal data for quick startup (last 24h only)
+        data_path: Optional path to Claude data directory
+
+    Returns:
+        The metadata section that was written
+    """
+    if quick_start and hours_back is None:
+        hours_back = 24
+
+    blocks, entries, metadata = _load_and_analyze(
+        hours_back, use_cache, quick_start, data_path
+    )
+
+    total_tokens = 0
+    total_cost = 0.0
+    with open(path, "wb") as handle:
+        handle.write(b'{"blocks":[')
+        for index, block in enumerate(blocks):
+            block_dict = _create_base_block_dict(block, columnar_entries=True)
+            _add_optional_block_data(block, block_dict)
+            if index:
+                handle.write(b",")
+            handle.write(_dumps(block_dict))
+            total_tokens += block.total_tokens
+            total_cost += block.cost_usd
+        handle.write(b'],"metadata":')
+        handle.write(_dumps(metadata))
+        handle.write(b',"entries_count":%d' % len(entries))
+        handle.write(b',"total_tokens":%d' % total_tokens)
+        handle.write(b',"total_cost":')
+        handle.write(_dumps(total_cost))
+        handle.write(b"}")
+
+    logger.info(f"analyze_usage_to_file wrote {len(blocks)} blocks to {path}")
+    return metadata
+
+
+async def analyze_usage_async(
+    hours_back: Optional[int] = 96,
+    use_cache: bool = True,
+    quick_start: bool = False,
+    data_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Async variant of analyze_usage for event-loop callers.
+
+    Offloads the blocking JSONL load and block transformation to the
+    default executor so an event loop keeps servicing input while usage
+    data is re-analyzed. The synchronous analyze_usage stays the CLI
+    entry point.
+
+    Args:
+        hours_back: Only analyze data from last N hours (None = all data)
+        use_cache: Use cached data when available
+        quick_start: Use minimal data for quick startup (last 24h only)
+        data_path: Optional path to Claude data directory
+
+    Returns:
+        Dictionary with analyzed blocks
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        partial(
+            analyze_usage,
+            hours_back=hours_back,
+            use_cache=use_cache,
+            quick_start=quick_start,
+            data_path=data_path,
+        ),
+    )
 
 
 def analyze_usage_with_billing_periods(
@@ -185,10 +353,47 @@ def analyze_usage_with_billing_periods(
     next_reset = calculator.get_next_reset_time()
     time_until_reset = calculator.get_time_until_reset()
 
-    # Calculate total cost from blocks data
-    total_cost = sum(block.get("costUSD", 0) for block in blocks_data)
+    # The aggregation pass only needs rerunning when block contents
+    # changed; between refresh ticks the cached usage section is reused
+    # and just the reset timestamps above are recomputed. The totals are
+    # independent of the period type, so it is not part of the key. The
+    # active block's fixed endTime would mask new entries for the whole
+    # session window, hence actualEndTime plus the entry count.
+    last_block = blocks_data[-1]
+    cache_key = (
+        len(blocks_data),
+        last_block.get("actualEndTime"),
+        last_block.get("entries_count"),
+    )
+    usage = _BILLING_USAGE_CACHE.get(cache_key)
+    if usage is None:
+        # Aggregate cost, tokens and entry counts from the block dicts
+        # in a single traversal rather than three generator sums.
+        import numpy as np
+
+        usage_totals = np.fromiter(
+            (
+                (
+                    block.get("costUSD", 0),
+                    block.get("totalTokens", 0),
+                    len(block.get("entries", [])),
+                )
+                for block in blocks_data
+            ),
+            dtype=np.dtype([("cost", "f8"), ("tokens", "i8"), ("entries", "i8")]),
+            count=len(blocks_data),
+        )
+        usage = {
+            "total_cost": float(usage_totals["cost"].sum()),
+            "total_tokens": int(usage_totals["tokens"].sum()),
+            "entries_count": int(usage_totals["entries"].sum()),
+            "session_blocks_count": len(blocks_data),
+        }
+        if len(_BILLING_USAGE_CACHE) >= 64:
+            _BILLING_USAGE_CACHE.clear()
+        _BILLING_USAGE_CACHE[cache_key] = usage
 
-    billing_summaries = [{
+    summary = {
         "period": {
             "type": current_period.period_type.value,
             "start_time": current_period.start_time.isoformat(),
@@ -196,25 +401,20 @@ def analyze_usage_with_billing_periods(
             "is_current": current_period.is_current,
             "duration_days": current_period.duration_days,
         },
-        "usage": {
-            "total_cost": total_cost,
-            "total_tokens": sum(block.get("totalTokens", 0) for block in blocks_data),
-            "entries_count": sum(len(block.get("entries", [])) for block in blocks_data),
-            "session_blocks_count": len(blocks_data),
-        }
-    }]
+        "usage": usage,
+    }
 
     # Add billing period data to result
     result["billing_periods"] = {
         "enabled": True,
         "period_type": billing_period_type,
-        "current_period": billing_summaries[0] if billing_summaries else None,
-        "recent_periods": billing_summaries,
+        "current_period": summary,
+        "recent_periods": [summary],
         "next_reset": next_reset.isoformat(),
         "time_until_reset": time_until_reset.total_seconds(),
     }
 
-    logger.info(f"Added {len(billing_summaries)} billing period summaries to result")
+    logger.info("Added billing period summary to result")
     return result
 
 
@@ -262,7 +462,7 @@ def _process_burn_rates(
             burn_rate = calculator.calculate_burn_rate(block)
             if burn_rate:
                 block.burn_rate_snapshot = burn_rate
-                projection = calculator.project_block_usage(block)
+                projection = calculator.project_block_usage(block, burn_rate)
                 if projection:
                     block.projection_data = {
                         "totalTokens": projection.projected_total_tokens,
@@ -274,11 +474,19 @@ def _process_burn_rates(
 def _create_result(
     blocks: List[SessionBlock], entries: List[UsageEntry], metadata: Dict[str, Any]
 ) -> Dict[str, Any]:
-    """Create the final result dictionary."""
+    """Create the final result dictionary.
+
+    Serialization routes through _convert_blocks_to_dict_format so large
+    histories shard across the process pool; the grand totals come from
+    a cheap second pass over the block objects.
+    """
     blocks_data = _convert_blocks_to_dict_format(blocks)
 
-    total_tokens = sum(b.total_tokens for b in blocks)
-    total_cost = sum(b.cost_usd for b in blocks)
+    total_tokens = 0
+    total_cost = 0.0
+    for block in blocks:
+        total_tokens += block.total_tokens
+        total_cost += block.cost_usd
 
     return {
         "blocks": blocks_data,
@@ -289,6 +497,39 @@ def _create_result(
     }
 
 
+def _assign_limits_to_blocks(
+    limit_detections: List[Dict[str, Any]], blocks: List[SessionBlock]
+) -> None:
+    """Attach formatted limit messages to the blocks containing them.
+
+    Limits are rare while blocks are numerous, so iterate the limits and
+    binary-search the block starting at or before each one — O(L log B)
+    instead of scanning every limit per block. Blocks from
+    transform_to_blocks are time-sorted and non-overlapping, which the
+    bisect relies on.
+    """
+    if not blocks:
+        return
+
+    block_starts = [block.start_time for block in blocks]
+    pending: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+
+    for limit_info in limit_detections:
+        timestamp = limit_info["timestamp"]
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        index = bisect_right(block_starts, timestamp) - 1
+        # End boundary stays inclusive like _is_limit_in_block_timerange,
+        # with one deliberate difference: a limit exactly on a shared
+        # boundary of two adjacent blocks lands only in the later block,
+        # where the old per-block scan attached it to both.
+        if index >= 0 and timestamp <= blocks[index].end_time:
+            pending[index].append(_format_limit_info(limit_info))
+
+    for index, messages in pending.items():
+        blocks[index].limit_messages = messages
+
+
 def _is_limit_in_block_timerange(
     limit_info: Dict[str, Any], block: SessionBlock
 ) -> bool:
@@ -315,26 +556,66 @@ def _format_limit_info(limit_info: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Block count below which process-pool serialization is not worth the
+# worker startup and pickling overhead.
+_PARALLEL_MIN_BLOCKS = 500
+
+
+def _serialize_block(block: SessionBlock) -> Dict[str, Any]:
+    """Serialize one block to its dict form."""
+    block_dict = _create_base_block_dict(block)
+    _add_optional_block_data(block, block_dict)
+    return block_dict
+
+
+def _serialize_block_chunk(blocks: List[SessionBlock]) -> List[Dict[str, Any]]:
+    """Serialize a slice of blocks; the process-pool work unit."""
+    return [_serialize_block(block) for block in blocks]
+
+
 def _convert_blocks_to_dict_format(blocks: List[SessionBlock]) -> List[Dict[str, Any]]:
-    """Convert blocks to dictionary format for JSON output."""
-    blocks_data: List[Dict[str, Any]] = []
+    """Convert blocks to dictionary format for JSON output.
 
-    for block in blocks:
-        block_dict = _create_base_block_dict(block)
-        _add_optional_block_data(block, block_dict)
-        blocks_data.append(block_dict)
+    Histories large enough to amortize worker startup are sharded across
+    a process pool, one contiguous slice per core; everything else
+    serializes in-process.
+    """
+    if len(blocks) < _PARALLEL_MIN_BLOCKS:
+        return [_serialize_block(block) for block in blocks]
+
+    import os
+    from concurrent.futures import ProcessPoolExecutor
 
+    workers = os.cpu_count() or 1
+    chunk_size = -(-len(blocks) // workers)
+    chunks = [
+        blocks[start : start + chunk_size]
+        for start in range(0, len(blocks), chunk_size)
+    ]
+
+    blocks_data: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(_serialize_block_chunk, chunks):
+            blocks_data.extend(part)
     return blocks_data
 
 
-def _create_base_block_dict(block: SessionBlock) -> Dict[str, Any]:
-    """Create base block dictionary with required fields."""
+def _create_base_block_dict(
+    block: SessionBlock, columnar_entries: bool = False
+) -> Dict[str, Any]:
+    """Create base block dictionary with required fields.
+
+    Args:
+        block: Session block to serialize
+        columnar_entries: Emit entries as one list per field instead of
+            one dict per entry (used by the streaming file writer)
+    """
     return {
         "id": block.id,
         "isActive": block.is_active,
         "isGap": block.is_gap,
-        "startTime": block.start_time.isoformat(),
-        "endTime": block.end_time.isoformat(),
+        "startTime": block.start_time_iso,
+        "endTime": block.end_time_iso,
         "actualEndTime": (
             block.actual_end_time.isoformat() if block.actual_end_time else None
         ),
@@ -351,16 +632,22 @@ def _create_base_block_dict(block: SessionBlock) -> Dict[str, Any]:
         "perModelStats": block.per_model_stats,
         "sentMessagesCount": block.sent_messages_count,
         "durationMinutes": block.duration_minutes,
-        "entries": _format_block_entries(block.entries),
+        "entries": (
+            _format_block_entries_columnar(block.entries)
+            if columnar_entries
+            else _format_block_entries(block.entries)
+        ),
         "entries_count": len(block.entries),
     }
 
 
 def _format_block_entries(entries: List[UsageEntry]) -> List[Dict[str, Any]]:
     """Format block entries for JSON output."""
+    if not entries:
+        return []
     return [
         {
-            "timestamp": entry.timestamp.isoformat(),
+            "timestamp": entry.timestamp_iso,
             "inputTokens": entry.input_tokens,
             "outputTokens": entry.output_tokens,
             "cacheCreationTokens": entry.cache_creation_tokens,
@@ -374,16 +661,47 @@ def _format_block_entries(entries: List[UsageEntry]) -> List[Dict[str, Any]]:
     ]
 
 
+def _format_block_entries_columnar(
+    entries: List[UsageEntry],
+) -> Dict[str, List[Any]]:
+    """Format block entries as columns (one list per field).
+
+    A dict of nine columns replaces one nine-key dict per entry, which
+    cuts allocation cost dramatically for blocks with many entries.
+    analyze_usage_to_file writes this layout; the dict-per-entry
+    _format_block_entries stays for the in-memory result.
+    """
+    if not entries:
+        return {}
+
+    return {
+        "timestamp": [entry.timestamp_iso for entry in entries],
+        "inputTokens": [entry.input_tokens for entry in entries],
+        "outputTokens": [entry.output_tokens for entry in entries],
+        "cacheCreationTokens": [entry.cache_creation_tokens for entry in entries],
+        "cacheReadInputTokens": [entry.cache_read_tokens for entry in entries],
+        "costUSD": [entry.cost_usd for entry in entries],
+        "model": [entry.model for entry in entries],
+        "messageId": [entry.message_id for entry in entries],
+        "requestId": [entry.request_id for entry in entries],
+    }
+
+
 def _add_optional_block_data(block: SessionBlock, block_dict: Dict[str, Any]) -> None:
-    """Add optional burn rate, projection, and limit data to block dict."""
-    if hasattr(block, "burn_rate_snapshot") and block.burn_rate_snapshot:
+    """Add optional burn rate, projection, and limit data to block dict.
+
+    These are declared SessionBlock fields with falsy defaults, so plain
+    attribute reads replace the old hasattr guards.
+    """
+    burn_rate = block.burn_rate_snapshot
+    if burn_rate:
         block_dict["burnRate"] = {
-            "tokensPerMinute": block.burn_rate_snapshot.tokens_per_minute,
-            "costPerHour": block.burn_rate_snapshot.cost_per_hour,
+            "tokensPerMinute": burn_rate.tokens_per_minute,
+            "costPerHour": burn_rate.cost_per_hour,
         }
 
-    if hasattr(block, "projection_data") and block.projection_data:
+    if block.projection_data:
         block_dict["projection"] = block.projection_data
 
-    if hasattr(block, "limit_messages") and block.limit_messages:
+    if block.limit_messages:
         block_dict["limitMessages"] = block.limit_messages
@@ -3,14 +3,72 @@
 Handles formatting and display of billing period cost information.
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
+from io import StringIO
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
 from claude_monitor.ui.progress_bars import CostProgressBar
 from claude_monitor.utils.formatting import format_currency, format_number
 from claude_monitor.utils.time_utils import format_display_time, format_duration
 
+# Costs and token totals change slowly between frames; both formatters
+# are pure functions of hashable scalars, so memoize repeat values.
+format_currency = lru_cache(maxsize=512)(format_currency)
+format_number = lru_cache(maxsize=512)(format_number)
+
+
+# fromisoformat accepts a trailing "Z" natively from Python 3.11, so the
+# replace() allocation is only needed on older interpreters.
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:  # pragma: no cover - pre-3.11 fallback
+
+    def _parse_iso(timestamp_str: str) -> datetime:
+        return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_timestamp(timestamp_str: str) -> datetime:
+    """Parse an ISO timestamp string, cached across refresh ticks.
+
+    The display re-renders the same period boundary strings every tick,
+    so each distinct string only needs parsing once.
+    """
+    return _parse_iso(timestamp_str)
+
+
+@lru_cache(maxsize=1024)
+def _format_time_cached(timestamp_str: str, timezone: str) -> str:
+    """Memoized body of _format_time.
+
+    Period boundary strings and the user timezone rarely change between
+    frames, so the tz lookup and strftime run once per distinct pair.
+    """
+    try:
+        timestamp = _parse_iso_timestamp(timestamp_str)
+        return format_display_time(timestamp, timezone, "auto")
+    except (ValueError, AttributeError):
+        return timestamp_str
+
+
+# All 21 possible 20-char progress bars, precomputed once.
+_PROGRESS_BARS = ["▓" * filled + "░" * (20 - filled) for filled in range(21)]
+
+
+# Period label templates keyed by period type; one dict lookup replaces
+# the if/elif chain per rendered row. Only weekly needs the end time.
+_LABEL_FORMATTERS = {
+    "daily": lambda start, end: start.strftime("%b %d"),
+    "weekly": lambda start, end: (
+        f"{start.strftime('%b %d')} - {end.strftime('%b %d')}"
+    ),
+    "monthly": lambda start, end: start.strftime("%b %Y"),
+}
+
 
 @dataclass
 class BillingPeriodDisplayData:
@@ -55,65 +113,70 @@ class BillingPeriodDisplayComponent:
         Returns:
             List of formatted display lines
         """
-        lines = []
-        
+        # Build into one StringIO buffer and split once at the end; per
+        # frame this beats growing a list of many small line strings.
+        buf = StringIO()
+        write = buf.write
+
         # Header
         period_type_display = data.period_type.title()
         status = "Current" if data.is_current else "Past"
-        lines.append(f"📊 {status} {period_type_display} Billing Period")
-        lines.append("")
+        write(f"📊 {status} {period_type_display} Billing Period\n\n")
 
         # Period information
         start_time = self._format_time(data.start_time, timezone)
         end_time = self._format_time(data.end_time, timezone)
-        lines.append(f"📅 Period: {start_time} → {end_time}")
-        lines.append(f"⏱️  Duration: {data.duration_days:.1f} days")
-        
+        write(f"📅 Period: {start_time} → {end_time}\n")
+        write(f"⏱️  Duration: {data.duration_days:.1f} days\n")
+
         if data.is_current and data.time_until_reset:
             time_remaining = self._format_time_remaining(data.time_until_reset)
-            lines.append(f"⏰ Time until reset: {time_remaining}")
-        
-        lines.append("")
+            write(f"⏰ Time until reset: {time_remaining}\n")
+
+        write("\n")
 
         # Cost summary
-        lines.append("💰 Cost Summary:")
-        lines.append(f"   Total cost: {format_currency(data.total_cost)}")
-        lines.append(f"   Daily average: {format_currency(data.average_cost_per_day)}")
-        
+        write("💰 Cost Summary:\n")
+        write(f"   Total cost: {format_currency(data.total_cost)}\n")
+        write(f"   Daily average: {format_currency(data.average_cost_per_day)}\n")
+
         if data.is_current:
             progress_bar = self._render_period_progress(data.cost_percentage_of_period)
-            lines.append(f"   Period progress: {progress_bar} {data.cost_percentage_of_period:.1f}%")
-        
-        lines.append("")
+            write(f"   Period progress: {progress_bar} {data.cost_percentage_of_period:.1f}%\n")
+
+        write("\n")
 
         # Usage statistics
-        lines.append("📈 Usage Statistics:")
-        lines.append(f"   Total tokens: {format_number(data.total_tokens)}")
-        lines.append(f"   API calls: {format_number(data.entries_count)}")
-        lines.append(f"   Models used: {len(data.models_used)}")
-        
+        write("📈 Usage Statistics:\n")
+        write(f"   Total tokens: {format_number(data.total_tokens)}\n")
+        write(f"   API calls: {format_number(data.entries_count)}\n")
+        write(f"   Models used: {len(data.models_used)}\n")
+
         if data.first_usage and data.last_usage:
             first_usage = self._format_time(data.first_usage, timezone)
             last_usage = self._format_time(data.last_usage, timezone)
-            lines.append(f"   First usage: {first_usage}")
-            lines.append(f"   Last usage: {last_usage}")
-        
-        lines.append("")
+            write(f"   First usage: {first_usage}\n")
+            write(f"   Last usage: {last_usage}\n")
+
+        write("\n")
 
         # Per-model breakdown if multiple models used
         if len(data.per_model_costs) > 1:
-            lines.append("🤖 Cost by Model:")
+            write("🤖 Cost by Model:\n")
             sorted_costs = sorted(
-                data.per_model_costs.items(), 
-                key=lambda x: x[1], 
+                data.per_model_costs.items(),
+                key=itemgetter(1),
                 reverse=True
             )
+            inv_total = 100.0 / data.total_cost if data.total_cost > 0 else 0.0
             for model, cost in sorted_costs:
-                percentage = (cost / data.total_cost * 100) if data.total_cost > 0 else 0
-                lines.append(f"   {model}: {format_currency(cost)} ({percentage:.1f}%)")
-            lines.append("")
+                write(
+                    f"   {model}: {format_currency(cost)} ({cost * inv_total:.1f}%)\n"
+                )
+            write("\n")
 
-        return lines
+        # Trailing "" from the final newline is not a display line
+        return buf.getvalue().split("\n")[:-1]
 
     def format_recent_periods_summary(
         self,
@@ -192,20 +255,10 @@ class BillingPeriodDisplayComponent:
         Returns:
             Formatted progress bar
         """
-        # Use a simple character-based progress bar
-        width = 20
-        filled = int(width * percentage / 100)
-        empty = width - filled
-        
-        if percentage < 50:
-            fill_char = "▓"
-        elif percentage < 80:
-            fill_char = "▓"
-        else:
-            fill_char = "▓"
-        
-        bar = fill_char * filled + "░" * empty
-        return f"[{bar}]"
+        # Index into the precomputed bar table; the old if/elif ladder
+        # assigned the same fill character on every branch.
+        filled = int(20 * percentage / 100)
+        return f"[{_PROGRESS_BARS[max(0, min(20, filled))]}]"
 
     def _format_time(self, timestamp_str: str, timezone: str) -> str:
         """Format timestamp for display.
@@ -217,11 +270,7 @@ class BillingPeriodDisplayComponent:
         Returns:
             Formatted time string
         """
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            return format_display_time(timestamp, timezone, "auto")
-        except (ValueError, AttributeError):
-            return timestamp_str
+        return _format_time_cached(timestamp_str, timezone)
 
     def _format_time_remaining(self, seconds: float) -> str:
         """Format time remaining until reset.
@@ -249,16 +298,15 @@ class BillingPeriodDisplayComponent:
             Period label string
         """
         try:
-            start_time = datetime.fromisoformat(period.start_time.replace('Z', '+00:00'))
-            
-            if period.period_type == "daily":
-                return start_time.strftime("%b %d")
-            elif period.period_type == "weekly":
-                end_time = datetime.fromisoformat(period.end_time.replace('Z', '+00:00'))
-                return f"{start_time.strftime('%b %d')} - {end_time.strftime('%b %d')}"
-            elif period.period_type == "monthly":
-                return start_time.strftime("%b %Y")
-            else:
-                return start_time.strftime("%b %d")
+            start_time = _parse_iso_timestamp(period.start_time)
+            end_time = (
+                _parse_iso_timestamp(period.end_time)
+                if period.period_type == "weekly"
+                else None
+            )
+            formatter = _LABEL_FORMATTERS.get(
+                period.period_type, _LABEL_FORMATTERS["daily"]
+            )
+            return formatter(start_time, end_time)
         except (ValueError, AttributeError):
             return f"{period.period_type.title()} Period"
\ No newline at end of file
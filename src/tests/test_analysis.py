@@ -1,8 +1,12 @@
 """Tests for data/analysis.py module."""
 
+import asyncio
+import json
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 
+import pytest
+
 from claude_monitor.core.models import (
     BurnRate,
     CostMode,
@@ -17,11 +21,23 @@ from claude_monitor.data.analysis import (
     _create_base_block_dict,
     _create_result,
     _format_block_entries,
+    _format_block_entries_columnar,
     _format_limit_info,
     _is_limit_in_block_timerange,
     _process_burn_rates,
     analyze_usage,
+    analyze_usage_async,
+    analyze_usage_to_file,
 )
+from claude_monitor.data import analysis as analysis_module
+
+
+@pytest.fixture(autouse=True)
+def _clear_analyze_cache():
+    """Keep analyze_usage's mtime-stamped cache from leaking between tests."""
+    analysis_module._ANALYZE_CACHE.clear()
+    yield
+    analysis_module._ANALYZE_CACHE.clear()
 
 
 class TestAnalyzeUsage:
@@ -200,6 +216,76 @@ class TestAnalyzeUsage:
         assert result["metadata"]["limits_detected"] == 0
         mock_analyzer.detect_limits.assert_not_called()
 
+    @patch("claude_monitor.data.analysis.load_usage_entries")
+    @patch("claude_monitor.data.analysis.SessionAnalyzer")
+    @patch("claude_monitor.data.analysis.BurnRateCalculator")
+    def test_analyze_usage_async(
+        self, mock_calc_class: Mock, mock_analyzer_class: Mock, mock_load: Mock
+    ) -> None:
+        """Test that the async wrapper returns the same result shape."""
+        mock_load.return_value = ([], None)
+
+        mock_analyzer = Mock()
+        mock_analyzer.transform_to_blocks.return_value = []
+        mock_analyzer_class.return_value = mock_analyzer
+
+        mock_calc_class.return_value = Mock()
+
+        result = asyncio.run(analyze_usage_async(hours_back=24))
+
+        assert result["blocks"] == []
+        assert result["entries_count"] == 0
+        mock_load.assert_called_once()
+
+    @patch("claude_monitor.data.analysis.load_usage_entries")
+    @patch("claude_monitor.data.analysis.SessionAnalyzer")
+    @patch("claude_monitor.data.analysis.BurnRateCalculator")
+    def test_analyze_usage_to_file(
+        self,
+        mock_calc_class: Mock,
+        mock_analyzer_class: Mock,
+        mock_load: Mock,
+        tmp_path,
+    ) -> None:
+        """Test the streaming file writer produces the result shape."""
+        sample_entry = UsageEntry(
+            timestamp=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+            input_tokens=100,
+            output_tokens=50,
+            cost_usd=0.001,
+            model="claude-3-haiku",
+        )
+
+        sample_block = SessionBlock(
+            id="block_1",
+            start_time=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+            end_time=datetime(2024, 1, 1, 17, 0, tzinfo=timezone.utc),
+            token_counts=TokenCounts(input_tokens=100, output_tokens=50),
+            cost_usd=0.001,
+            entries=[sample_entry],
+        )
+
+        mock_load.return_value = ([sample_entry], None)
+
+        mock_analyzer = Mock()
+        mock_analyzer.transform_to_blocks.return_value = [sample_block]
+        mock_analyzer_class.return_value = mock_analyzer
+
+        mock_calc_class.return_value = Mock()
+
+        out_path = tmp_path / "response_final.json"
+        metadata = analyze_usage_to_file(str(out_path), hours_back=24)
+
+        assert metadata["blocks_created"] == 1
+        written = json.loads(out_path.read_text())
+        assert written["entries_count"] == 1
+        assert written["total_tokens"] == 150
+        assert written["total_cost"] == 0.001
+        assert written["blocks"][0]["id"] == "block_1"
+        # The streaming writer emits entries in the columnar layout
+        assert written["blocks"][0]["entries"]["inputTokens"] == [100]
+        assert written["metadata"]["blocks_created"] == 1
+
 
 class TestProcessBurnRates:
     """Test the _process_burn_rates function."""
@@ -234,7 +320,7 @@ class TestProcessBurnRates:
         calculator.project_block_usage.return_value = projection
         _process_burn_rates(blocks, calculator)
         calculator.calculate_burn_rate.assert_called_once_with(active_block)
-        calculator.project_block_usage.assert_called_once_with(active_block)
+        calculator.project_block_usage.assert_called_once_with(active_block, burn_rate)
         assert hasattr(active_block, "burn_rate_snapshot")
         assert active_block.burn_rate_snapshot == burn_rate
         assert hasattr(active_block, "projection_data")
@@ -287,8 +373,11 @@ class TestProcessBurnRates:
 class TestCreateResult:
     """Test the _create_result function."""
 
-    @patch("claude_monitor.data.analysis._convert_blocks_to_dict_format")
-    def test_create_result_basic(self, mock_convert: Mock) -> None:
+    @patch("claude_monitor.data.analysis._add_optional_block_data")
+    @patch("claude_monitor.data.analysis._create_base_block_dict")
+    def test_create_result_basic(
+        self, mock_create_base: Mock, mock_add_optional: Mock
+    ) -> None:
         """Test basic _create_result functionality."""
         # Create test blocks
         block1 = Mock()
@@ -303,7 +392,7 @@ class TestCreateResult:
         entries = [Mock(), Mock(), Mock()]
         metadata = {"test": "metadata"}
 
-        mock_convert.return_value = [{"block": "data1"}, {"block": "data2"}]
+        mock_create_base.side_effect = [{"block": "data1"}, {"block": "data2"}]
 
         result = _create_result(blocks, entries, metadata)
 
@@ -315,7 +404,8 @@ class TestCreateResult:
             "total_cost": 0.003,
         }
 
-        mock_convert.assert_called_once_with(blocks)
+        assert mock_create_base.call_count == 2
+        assert mock_add_optional.call_count == 2
 
     def test_create_result_empty(self) -> None:
         """Test _create_result with empty data."""
@@ -449,6 +539,43 @@ class TestBlockConversion:
             "requestId": "req_1",
         }
 
+    def test_format_block_entries_columnar(self) -> None:
+        """Test _format_block_entries_columnar function."""
+        entry1 = UsageEntry(
+            timestamp=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+            input_tokens=100,
+            output_tokens=50,
+            cache_creation_tokens=10,
+            cache_read_tokens=5,
+            cost_usd=0.001,
+            model="claude-3-haiku",
+            message_id="msg_1",
+            request_id="req_1",
+        )
+
+        entry2 = UsageEntry(
+            timestamp=datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+            input_tokens=200,
+            output_tokens=100,
+            cost_usd=0.002,
+            model="claude-3-sonnet",
+            message_id="msg_2",
+            request_id="req_2",
+        )
+
+        result = _format_block_entries_columnar([entry1, entry2])
+
+        assert result["timestamp"] == [
+            "2024-01-01T12:00:00+00:00",
+            "2024-01-01T12:30:00+00:00",
+        ]
+        assert result["inputTokens"] == [100, 200]
+        assert result["outputTokens"] == [50, 100]
+        assert result["costUSD"] == [0.001, 0.002]
+        assert result["model"] == ["claude-3-haiku", "claude-3-sonnet"]
+
+        assert _format_block_entries_columnar([]) == {}
+
     def test_create_base_block_dict(self) -> None:
         """Test _create_base_block_dict function."""
         entry = UsageEntry(
@@ -538,15 +665,11 @@ class TestBlockConversion:
         ]
 
     def test_add_optional_block_data_no_fields(self) -> None:
-        """Test _add_optional_block_data with no optional fields."""
+        """Test _add_optional_block_data with optional fields at defaults."""
         block = Mock()
-        # Remove all optional attributes
-        if hasattr(block, "burn_rate_snapshot"):
-            del block.burn_rate_snapshot
-        if hasattr(block, "projection_data"):
-            del block.projection_data
-        if hasattr(block, "limit_messages"):
-            del block.limit_messages
+        block.burn_rate_snapshot = None
+        block.projection_data = None
+        block.limit_messages = []
 
         block_dict = {}
         _add_optional_block_data(block, block_dict)
@@ -5,186 +5,307 @@ from datetime import datetime, timezone, timedelta
 from claude_monitor.core.billing_periods import BillingPeriodCalculator
 from claude_monitor.core.models import BillingPeriodType, SessionBlock, UsageEntry, TokenCounts
 
+UTC = timezone.utc
+
+# Reference timestamps shared across tests, built once at import time
+# instead of re-running the datetime constructor in every test body.
+CUSTOM_START = datetime(2024, 1, 10, 0, 0, 0, tzinfo=UTC)
+REF_JAN15_1430 = datetime(2024, 1, 15, 14, 30, 0, tzinfo=UTC)
+REF_JAN17_1430 = datetime(2024, 1, 17, 14, 30, 0, tzinfo=UTC)  # a Wednesday
+REF_JAN20_1430 = datetime(2024, 1, 20, 14, 30, 0, tzinfo=UTC)
+JAN15_1000 = datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC)
+
+# Every test here is pure and shares no mutable state, so the module is
+# safe to run under pytest-xdist; the group keeps it packed onto one
+# worker (pytest -n auto --dist=loadgroup).
+pytestmark = pytest.mark.xdist_group("billing_periods_pure")
+
+
+# The calculators are read-only for these tests, so one instance per
+# period type is built for the whole session instead of re-resolving the
+# timezone in every test.
+@pytest.fixture(scope="session")
+def utc_daily_calc():
+    return BillingPeriodCalculator(
+        period_type=BillingPeriodType.DAILY,
+        user_timezone="UTC",
+    )
+
+
+@pytest.fixture(scope="session")
+def utc_weekly_calc():
+    return BillingPeriodCalculator(
+        period_type=BillingPeriodType.WEEKLY,
+        user_timezone="UTC",
+    )
+
+
+@pytest.fixture(scope="session")
+def utc_monthly_calc():
+    return BillingPeriodCalculator(
+        period_type=BillingPeriodType.MONTHLY,
+        user_timezone="UTC",
+    )
+
+
+@pytest.fixture(scope="session")
+def utc_custom_calc():
+    return BillingPeriodCalculator(
+        period_type=BillingPeriodType.CUSTOM,
+        custom_start_date=CUSTOM_START,
+        user_timezone="UTC",
+    )
+
+
+# Summary creation only reads blocks, so one canonical two-entry block
+# can serve every summary test without per-test allocation.
+@pytest.fixture(scope="session")
+def canonical_session_block():
+    entry1 = UsageEntry(
+        timestamp=JAN15_1000,
+        input_tokens=100,
+        output_tokens=50,
+        cost_usd=0.05,
+        model="claude-3-sonnet",
+    )
+    entry2 = UsageEntry(
+        timestamp=JAN15_1000.replace(hour=12),
+        input_tokens=200,
+        output_tokens=100,
+        cost_usd=0.10,
+        model="claude-3-sonnet",
+    )
+    return SessionBlock(
+        id="test-session",
+        start_time=JAN15_1000,
+        end_time=JAN15_1000.replace(hour=15),
+        entries=[entry1, entry2],
+        token_counts=TokenCounts(input_tokens=300, output_tokens=150),
+        cost_usd=0.15,
+    )
+
 
 class TestBillingPeriodCalculator:
     """Test billing period calculations."""
 
-    def test_daily_period_calculation(self):
-        """Test daily billing period boundaries."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.DAILY,
-            user_timezone="UTC"
-        )
-        
-        # Test with a specific reference time
-        reference_time = datetime(2024, 1, 15, 14, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
-        
-        assert period.period_type == BillingPeriodType.DAILY
-        assert period.start_time.day == 15
-        assert period.start_time.hour == 0
-        assert period.start_time.minute == 0
-        assert period.end_time.day == 16
-        assert period.end_time.hour == 0
+    @pytest.mark.parametrize(
+        "calc_fixture,reference_time,period_type,start,start_day,start_month,"
+        "start_hour,start_weekday,end_day,end_hour,duration_days",
+        [
+            pytest.param(
+                "utc_daily_calc", REF_JAN15_1430, BillingPeriodType.DAILY,
+                None, 15, None, 0, None, 16, 0, None,
+                id="daily",
+            ),
+            # A Wednesday; the period should snap back to Monday
+            pytest.param(
+                "utc_weekly_calc", REF_JAN17_1430, BillingPeriodType.WEEKLY,
+                None, None, None, None, 0, None, None, 7.0,
+                id="weekly",
+            ),
+            pytest.param(
+                "utc_monthly_calc", REF_JAN15_1430, BillingPeriodType.MONTHLY,
+                None, 1, 1, None, None, None, None, None,
+                id="monthly",
+            ),
+            # A date within the first custom period
+            pytest.param(
+                "utc_custom_calc", REF_JAN20_1430, BillingPeriodType.CUSTOM,
+                CUSTOM_START, None, None, None, None, None, None, None,
+                id="custom",
+            ),
+        ],
+    )
+    def test_period_boundaries(
+        self, request, calc_fixture, reference_time, period_type, start,
+        start_day, start_month, start_hour, start_weekday, end_day, end_hour,
+        duration_days,
+    ):
+        """Test current-period boundaries for each period type.
 
-    def test_weekly_period_calculation(self):
-        """Test weekly billing period boundaries."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.WEEKLY,
-            user_timezone="UTC"
-        )
-        
-        # Test with a Wednesday (weekday 2)
-        reference_time = datetime(2024, 1, 17, 14, 30, 0, tzinfo=timezone.utc)  # Wednesday
+        Expected values use None as don't-care so each case only pins the
+        attributes the original per-type test asserted.
+        """
+        calculator = request.getfixturevalue(calc_fixture)
         period = calculator.get_current_period(reference_time)
-        
-        assert period.period_type == BillingPeriodType.WEEKLY
-        assert period.start_time.weekday() == 0  # Monday
-        assert period.duration_days == 7.0
 
-    def test_monthly_period_calculation(self):
-        """Test monthly billing period boundaries."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.MONTHLY,
-            user_timezone="UTC"
-        )
-        
-        # Test with mid-month date
-        reference_time = datetime(2024, 1, 15, 14, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
-        
-        assert period.period_type == BillingPeriodType.MONTHLY
-        assert period.start_time.day == 1
-        assert period.start_time.month == 1
-
-    def test_custom_period_calculation(self):
-        """Test custom billing period boundaries."""
-        custom_start = datetime(2024, 1, 10, 0, 0, 0, tzinfo=timezone.utc)
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.CUSTOM,
-            custom_start_date=custom_start,
-            user_timezone="UTC"
-        )
-        
-        # Test with a date within the first custom period
-        reference_time = datetime(2024, 1, 20, 14, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
-        
-        assert period.period_type == BillingPeriodType.CUSTOM
-        assert period.start_time == custom_start
+        assert period.period_type == period_type
+        if start is not None:
+            assert period.start_time == start
+        if start_day is not None:
+            assert period.start_time.day == start_day
+        if start_month is not None:
+            assert period.start_time.month == start_month
+        if start_hour is not None:
+            assert period.start_time.hour == start_hour
+            assert period.start_time.minute == 0
+        if start_weekday is not None:
+            assert period.start_time.weekday() == start_weekday
+        if end_day is not None:
+            assert period.end_time.day == end_day
+        if end_hour is not None:
+            assert period.end_time.hour == end_hour
+        if duration_days is not None:
+            assert period.duration_days == duration_days
 
-    def test_period_summary_creation(self):
+    def test_period_summary_creation(self, utc_daily_calc, canonical_session_block):
         """Test creation of billing period summary from session blocks."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.DAILY,
-            user_timezone="UTC"
-        )
-        
         # Create a test period
-        reference_time = datetime(2024, 1, 15, 14, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
-        
-        # Create test session blocks with usage entries
-        entry1 = UsageEntry(
-            timestamp=datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc),
-            input_tokens=100,
-            output_tokens=50,
-            cost_usd=0.05,
-            model="claude-3-sonnet"
-        )
-        
-        entry2 = UsageEntry(
-            timestamp=datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc),
-            input_tokens=200,
-            output_tokens=100,
-            cost_usd=0.10,
-            model="claude-3-sonnet"
-        )
-        
-        # Create session block
-        session_block = SessionBlock(
-            id="test-session",
-            start_time=datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc),
-            end_time=datetime(2024, 1, 15, 15, 0, 0, tzinfo=timezone.utc),
-            entries=[entry1, entry2],
-            token_counts=TokenCounts(input_tokens=300, output_tokens=150),
-            cost_usd=0.15
-        )
-        
+        period = utc_daily_calc.get_current_period(REF_JAN15_1430)
+
         # Create period summary
-        summary = calculator.create_period_summary(period, [session_block])
+        summary = utc_daily_calc.create_period_summary(
+            period, [canonical_session_block]
+        )
         
-        assert abs(summary.total_cost - 0.15) < 0.001  # Handle floating point precision
+        assert summary.total_cost_micros == 150_000  # Exact: costs sum in micro-USD
         assert summary.total_tokens_calculated == 450
         assert summary.entries_count == 2
         assert len(summary.session_blocks) == 1
         assert "claude-3-sonnet" in summary.models_used
 
-    def test_recent_periods(self):
+    def test_period_summary_creation_many_entries(self, utc_daily_calc):
+        """Test summary creation on a block large enough for the NumPy path."""
+        period = utc_daily_calc.get_current_period(REF_JAN15_1430)
+
+        # 100 entries inside the period plus one on the previous day
+        entries = [
+            UsageEntry(
+                timestamp=JAN15_1000 + timedelta(seconds=i),
+                input_tokens=10,
+                output_tokens=5,
+                cost_usd=0.01,
+                model="claude-3-sonnet" if i % 2 else "claude-3-opus",
+            )
+            for i in range(100)
+        ]
+        entries.append(
+            UsageEntry(
+                timestamp=JAN15_1000.replace(day=14),
+                input_tokens=999,
+                output_tokens=999,
+                cost_usd=9.99,
+                model="claude-3-opus",
+            )
+        )
+
+        session_block = SessionBlock(
+            id="test-session-large",
+            start_time=JAN15_1000.replace(day=14),
+            end_time=JAN15_1000.replace(hour=15),
+            entries=entries,
+        )
+
+        summary = utc_daily_calc.create_period_summary(period, [session_block])
+
+        assert summary.entries_count == 100
+        assert abs(summary.total_cost - 1.0) < 0.001
+        assert summary.token_counts.input_tokens == 1000
+        assert summary.token_counts.output_tokens == 500
+        assert sorted(summary.models_used) == ["claude-3-opus", "claude-3-sonnet"]
+        assert abs(summary.per_model_costs["claude-3-sonnet"] - 0.50) < 0.001
+        assert summary.first_usage == entries[0].timestamp
+        assert summary.last_usage == entries[99].timestamp
+
+    def test_summarize_batch_matches_per_period_summaries(self, utc_daily_calc):
+        """Test that batch summarization matches one-at-a-time summaries."""
+        # Spread 120 entries over three consecutive days
+        entries = [
+            UsageEntry(
+                timestamp=JAN15_1000.replace(day=13, hour=0, minute=30)
+                + timedelta(minutes=37 * i),
+                input_tokens=10,
+                output_tokens=5,
+                cost_usd=0.01,
+                model="claude-3-sonnet" if i % 3 else "claude-3-opus",
+            )
+            for i in range(120)
+        ]
+        session_block = SessionBlock(
+            id="test-session-batch",
+            start_time=entries[0].timestamp,
+            end_time=entries[-1].timestamp,
+            entries=entries,
+        )
+
+        periods = utc_daily_calc.get_recent_periods(
+            count=3, reference_time=REF_JAN15_1430
+        )
+
+        batch = utc_daily_calc.summarize_batch(periods, [session_block])
+
+        assert len(batch) == 3
+        for summary, period in zip(batch, periods):
+            expected = utc_daily_calc.create_period_summary(period, [session_block])
+            assert summary.entries_count == expected.entries_count
+            assert abs(summary.total_cost - expected.total_cost) < 1e-9
+            assert summary.token_counts == expected.token_counts
+            assert sorted(summary.models_used) == sorted(expected.models_used)
+            assert summary.per_model_costs.keys() == expected.per_model_costs.keys()
+            assert summary.first_usage == expected.first_usage
+            assert summary.last_usage == expected.last_usage
+            assert summary.session_blocks == expected.session_blocks
+
+    def test_recent_periods(self, utc_daily_calc):
         """Test getting recent billing periods."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.DAILY,
-            user_timezone="UTC"
+        # Fixed reference time keeps the test deterministic and avoids a
+        # wall-clock read inside get_recent_periods
+        periods = utc_daily_calc.get_recent_periods(
+            count=3, reference_time=REF_JAN15_1430
         )
-        
-        # Use current time for this test so we get a current period
-        periods = calculator.get_recent_periods(count=3)
-        
+
         assert len(periods) == 3
         # The first period should contain the current time and be marked as current
         assert periods[0].is_current  # Current period
         assert not periods[1].is_current  # Previous period
         assert not periods[2].is_current  # Period before that
 
-    def test_next_reset_time(self):
-        """Test calculation of next billing period reset."""
+    def test_recent_periods_across_dst_transition(self):
+        """Test that walking back past a DST change re-localizes offsets."""
         calculator = BillingPeriodCalculator(
             period_type=BillingPeriodType.DAILY,
-            user_timezone="UTC"
+            user_timezone="US/Eastern",
         )
-        
-        reference_time = datetime(2024, 1, 15, 14, 30, 0, tzinfo=timezone.utc)
-        next_reset = calculator.get_next_reset_time(reference_time)
+        # US/Eastern sprang forward on 2024-03-10
+        reference_time = datetime(2024, 3, 12, 12, 0, 0, tzinfo=UTC)
+        periods = calculator.get_recent_periods(
+            count=6, reference_time=reference_time
+        )
+
+        assert periods[0].start_time.utcoffset() == timedelta(hours=-4)
+        # Periods before the transition must carry the standard-time offset
+        for period in periods[3:]:
+            assert period.start_time.utcoffset() == timedelta(hours=-5)
+            assert period.start_time.hour == 0
+
+    def test_next_reset_time(self, utc_daily_calc):
+        """Test calculation of next billing period reset."""
+        next_reset = utc_daily_calc.get_next_reset_time(REF_JAN15_1430)
         
         assert next_reset.day == 16
         assert next_reset.hour == 0
         assert next_reset.minute == 0
 
-    def test_time_until_reset(self):
+    def test_time_until_reset(self, utc_daily_calc):
         """Test calculation of time remaining until reset."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.DAILY,
-            user_timezone="UTC"
-        )
-        
-        reference_time = datetime(2024, 1, 15, 14, 30, 0, tzinfo=timezone.utc)
-        time_until_reset = calculator.get_time_until_reset(reference_time)
+        time_until_reset = utc_daily_calc.get_time_until_reset(REF_JAN15_1430)
         
         # Should be about 9.5 hours until midnight
         expected_seconds = 9.5 * 3600
         assert abs(time_until_reset.total_seconds() - expected_seconds) < 60  # Within 1 minute
 
-    def test_period_contains_timestamp(self):
+    def test_period_contains_timestamp(self, utc_daily_calc):
         """Test period timestamp containment check."""
-        calculator = BillingPeriodCalculator(
-            period_type=BillingPeriodType.DAILY,
-            user_timezone="UTC"
-        )
-        
-        reference_time = datetime(2024, 1, 15, 14, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
-        
+        period = utc_daily_calc.get_current_period(REF_JAN15_1430)
+
         # Timestamp within period
-        within_timestamp = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
-        assert period.contains_timestamp(within_timestamp)
-        
+        assert period.contains_timestamp(JAN15_1000)
+
         # Timestamp outside period (previous day)
-        outside_timestamp = datetime(2024, 1, 14, 10, 0, 0, tzinfo=timezone.utc)
-        assert not period.contains_timestamp(outside_timestamp)
-        
+        assert not period.contains_timestamp(JAN15_1000.replace(day=14))
+
         # Timestamp outside period (next day)
-        future_timestamp = datetime(2024, 1, 16, 10, 0, 0, tzinfo=timezone.utc)
-        assert not period.contains_timestamp(future_timestamp)
+        assert not period.contains_timestamp(JAN15_1000.replace(day=16))
 
     def test_custom_reset_day_daily(self):
         """Test daily periods with custom reset hour."""
@@ -193,17 +314,15 @@ class TestBillingPeriodCalculator:
             reset_day=6,  # 6 AM reset
             user_timezone="UTC"
         )
-        
+
         # Test before reset time (should use previous day's reset)
-        reference_time = datetime(2024, 1, 15, 4, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
-        
+        period = calculator.get_current_period(REF_JAN15_1430.replace(hour=4))
+
         assert period.start_time.day == 14
         assert period.start_time.hour == 6
-        
+
         # Test after reset time (should use today's reset)
-        reference_time = datetime(2024, 1, 15, 8, 30, 0, tzinfo=timezone.utc)
-        period = calculator.get_current_period(reference_time)
+        period = calculator.get_current_period(REF_JAN15_1430.replace(hour=8))
         
         assert period.start_time.day == 15
         assert period.start_time.hour == 6
@@ -218,8 +337,7 @@ class TestBillingPeriodCalculator:
         )
         
         # Test on a Friday (should start from previous Wednesday)
-        reference_time = datetime(2024, 1, 19, 14, 30, 0, tzinfo=timezone.utc)  # Friday
-        period = calculator.get_current_period(reference_time)
+        period = calculator.get_current_period(REF_JAN15_1430.replace(day=19))
         
         assert period.start_time.weekday() == 2  # Wednesday
         assert period.duration_days == 7.0
\ No newline at end of file